@@ -1,3 +1,5 @@
+import functools
+import io
 import logging
 import sys
 import os
@@ -13,7 +15,7 @@ from scanner.copyright_checker import CopyrightChecker
 LOG_PREFIX = "< file license/copyright check >"
 
 # Define a dictionary of permissive licenses
-PERMISSIVE_LICENSES = [
+PERMISSIVE_LICENSES = frozenset([
     "BSD-3-Clause",
     "MIT",
     "Apache-1.0",
@@ -36,9 +38,9 @@ PERMISSIVE_LICENSES = [
     "LicenseRef-scancode-unicode",
     "Apache-2.0 WITH LLVM-exception",
     "Apache-2.0 WITH LLVM-exception AND Apache-2.0 AND LLVM-exception",
-]
+])
 
-COPYLEFT_LICENSES = [
+COPYLEFT_LICENSES = frozenset([
     "GPL-1.0-only",
     "GPL-1.0-or-later",
     "GPL-2.0-only",
@@ -56,7 +58,13 @@ COPYLEFT_LICENSES = [
     "LicenseRef-scancode-agpl-2.0",
     "AGPL-3.0-only",
     "AGPL-3.0-or-later"
-]
+])
+
+# License markings of known projects, keyed by PROJECT_NAME (first entry wins)
+PROJECT_MARKINGS = {
+    project['PROJECT_NAME']: project['MARKINGS']
+    for project in reversed(config.data['projects'])
+}
 
 def detect_license_from_file(license_file_path: str) -> str:
     """
@@ -140,10 +148,14 @@ def get_license(repo_name: str) -> str:
     
     # Fallback to config file lookup
     print(f"{LOG_PREFIX} License file not found or detection failed, checking config...")
-    for project in config.data['projects']:
-        if repo_name.endswith(f"/{project['PROJECT_NAME']}") or repo_name == project['PROJECT_NAME']:
-            print(f"{LOG_PREFIX} Using license from config: {project['MARKINGS']}")
-            return project['MARKINGS']
+    # PROJECT_NAME matches the whole repo name or its trailing path components,
+    # so try the most specific candidate first
+    parts = repo_name.split('/')
+    for start in range(len(parts)):
+        markings = PROJECT_MARKINGS.get('/'.join(parts[start:]))
+        if markings:
+            print(f"{LOG_PREFIX} Using license from config: {markings}")
+            return markings
     
     # Return the default license if nothing else works
     print(f"{LOG_PREFIX} Using default license: BSD-3-Clause-Clear")
@@ -165,63 +177,71 @@ def beautify_output(flagged_files: dict, warning_files: dict, license: str, log_
         print(f"{log_prefix} ✅ No license or copyright issues detected")
         sys.exit(0)
     
-    output = []
-    output.append(f"{log_prefix} ┌───────────────────────────────────────────┐")
-    output.append(f"{log_prefix} │           **Flagged Files Report**         │")
-    output.append(f"{log_prefix} ├───────────────────────────────────────────┤")
+    buf = io.StringIO()
+    write = buf.write
+    prefix = log_prefix + " "
+
+    def emit(text: str) -> None:
+        write(prefix)
+        write(text)
+        write("\n")
+
+    emit("┌───────────────────────────────────────────┐")
+    emit("│           **Flagged Files Report**         │")
+    emit("├───────────────────────────────────────────┤")
     
     # Add COMPLIANCE.md reference
-    output.append(f"{log_prefix} │")
-    output.append(f"{log_prefix} │ 📖 For more information, see: COMPLIANCE.md")
-    output.append(f"{log_prefix} │    https://github.com/qualcomm/copyright-license-checker-action/blob/main/COMPLIANCE.md")
-    output.append(f"{log_prefix} ├───────────────────────────────────────────┤")
+    emit("│")
+    emit("│ 📖 For more information, see: COMPLIANCE.md")
+    emit("│    https://github.com/qualcomm/copyright-license-checker-action/blob/main/COMPLIANCE.md")
+    emit("├───────────────────────────────────────────┤")
 
     # Print blocking errors first
     if flagged_files:
-        output.append(f"{log_prefix} │")
-        output.append(f"{log_prefix} │ ═══════════════════════════════════════════")
-        output.append(f"{log_prefix} │ 🚨  B L O C K I N G   E R R O R S")
-        output.append(f"{log_prefix} │ ═══════════════════════════════════════════")
+        emit("│")
+        emit("│ ═══════════════════════════════════════════")
+        emit("│ 🚨  B L O C K I N G   E R R O R S")
+        emit("│ ═══════════════════════════════════════════")
         for file, issues in flagged_files.items():
-            output.append(f"{log_prefix} │")
-            output.append(f"{log_prefix} │ ┌─ 📄 F I L E: {file}")
+            emit("│")
+            emit(f"│ ┌─ 📄 F I L E: {file}")
             if issues['license_issues']:
-                output.append(f"{log_prefix} │ │")
-                output.append(f"{log_prefix} │ ├─ 🚨 LICENSE ISSUES:")
+                emit("│ │")
+                emit("│ ├─ 🚨 LICENSE ISSUES:")
                 for issue in issues['license_issues']:
-                    output.append(f"{log_prefix} │ │  • {issue}")
+                    emit(f"│ │  • {issue}")
             if issues['copyright_issues']:
-                output.append(f"{log_prefix} │ │")
-                output.append(f"{log_prefix} │ ├─ 🚨 COPYRIGHT ISSUES:")
+                emit("│ │")
+                emit("│ ├─ 🚨 COPYRIGHT ISSUES:")
                 for issue in issues['copyright_issues']:
-                    output.append(f"{log_prefix} │ │  • {issue}")
-            output.append(f"{log_prefix} │ └─────────────────────────────────────────")
+                    emit(f"│ │  • {issue}")
+            emit("│ └─────────────────────────────────────────")
 
     # Print warnings (non-blocking)
     if warning_files:
-        output.append(f"{log_prefix} │")
-        output.append(f"{log_prefix} │ ═══════════════════════════════════════════")
-        output.append(f"{log_prefix} │ ⚠️   W A R N I N G S  (Non-blocking)")
-        output.append(f"{log_prefix} │ ═══════════════════════════════════════════")
+        emit("│")
+        emit("│ ═══════════════════════════════════════════")
+        emit("│ ⚠️   W A R N I N G S  (Non-blocking)")
+        emit("│ ═══════════════════════════════════════════")
         for file, issues in warning_files.items():
-            output.append(f"{log_prefix} │")
-            output.append(f"{log_prefix} │ ┌─ 📄 F I L E: {file}")
+            emit("│")
+            emit(f"│ ┌─ 📄 F I L E: {file}")
             if issues['license_issues']:
-                output.append(f"{log_prefix} │ │")
-                output.append(f"{log_prefix} │ ├─ ⚠️  LICENSE WARNINGS:")
+                emit("│ │")
+                emit("│ ├─ ⚠️  LICENSE WARNINGS:")
                 for issue in issues['license_issues']:
-                    output.append(f"{log_prefix} │ │  • {issue}")
+                    emit(f"│ │  • {issue}")
             if issues['copyright_issues']:
-                output.append(f"{log_prefix} │ │")
-                output.append(f"{log_prefix} │ ├─ ⚠️  COPYRIGHT WARNINGS:")
+                emit("│ │")
+                emit("│ ├─ ⚠️  COPYRIGHT WARNINGS:")
                 for issue in issues['copyright_issues']:
-                    output.append(f"{log_prefix} │ │  • {issue}")
-            output.append(f"{log_prefix} │ └─────────────────────────────────────────")
+                    emit(f"│ │  • {issue}")
+            emit("│ └─────────────────────────────────────────")
     
-    output.append(f"{log_prefix} └───────────────────────────────────────────┘")
+    emit("└───────────────────────────────────────────┘")
 
     # Print the entire output block
-    print("\n".join(output))
+    print(buf.getvalue(), end="")
 
     # Only exit with error if there are blocking issues
     if flagged_files:
@@ -229,6 +249,7 @@ def beautify_output(flagged_files: dict, warning_files: dict, license: str, log_
     else:
         sys.exit(0)
 
+@functools.lru_cache(maxsize=4096)
 def is_uncertain_license_issue(issue: str) -> bool:
     """
     Check if a license issue is ONLY related to uncertain/unknown licenses.
@@ -303,6 +324,11 @@ def main() -> None:
     logging.basicConfig(level=logging.WARNING)
 
     patch = Patch(sys.argv[1])
+    # Nothing to check: skip license detection and the license index load
+    if not patch.changes:
+        print(f"{LOG_PREFIX} ✅ No changes to check")
+        sys.exit(0)
+
     repo_name = sys.argv[2]
     license = get_license(repo_name)
     if license in PERMISSIVE_LICENSES:
@@ -324,8 +350,9 @@ def main() -> None:
     
     for file, issues in flagged_license_files.items():
         # Separate uncertain license issues (warnings) from real errors
-        error_issues = [issue for issue in issues if not is_uncertain_license_issue(issue)]
-        warning_issues = [issue for issue in issues if is_uncertain_license_issue(issue)]
+        error_issues, warning_issues = [], []
+        for issue in issues:
+            (warning_issues if is_uncertain_license_issue(issue) else error_issues).append(issue)
         
         if error_issues:
             flagged_files[file] = {'license_issues': error_issues, 'copyright_issues': []}
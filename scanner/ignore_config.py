@@ -1,8 +1,13 @@
 """
 Module to load optional .licenseignore configuration.
 """
+import re
 import pathspec
 from pathlib import Path
+from pathspec.util import normalize_file
+
+# Named groups cannot repeat in a union of pattern regexes
+_NAMED_GROUP_RE = re.compile(r'\(\?P<\w+>')
 
 class IgnoreConfig:
     """
@@ -26,6 +31,31 @@ class IgnoreConfig:
         else:
             self.patterns = []
             self.spec = None
+        self.regex = self._compile_union(self.spec)
+
+    @staticmethod
+    def _compile_union(spec):
+        """
+        Union the regexes of all patterns into a single compiled regex.
+
+        This is only possible when no pattern is negated: with "!" patterns the
+        last matching pattern decides, which a union cannot express.
+
+        Args:
+            spec (PathSpec): The compiled patterns, or None.
+
+        Returns:
+            re.Pattern: The union of the pattern regexes, or None if the
+            patterns cannot be combined.
+        """
+        if not spec:
+            return None
+        patterns = [pattern for pattern in spec.patterns if pattern.include is not None]
+        if not patterns or any(not pattern.include for pattern in patterns):
+            return None
+        return re.compile('|'.join(
+            f"(?:{_NAMED_GROUP_RE.sub('(?:', pattern.regex.pattern)})" for pattern in patterns
+        ))
 
     def is_excluded(self, file_path: str) -> bool:
         """
@@ -37,6 +67,8 @@ class IgnoreConfig:
         Returns:
             bool: True if the file should be excluded, False otherwise
         """
+        if self.regex is not None:
+            return self.regex.match(normalize_file(file_path)) is not None
         if not self.spec:
             return False
         return self.spec.match_file(file_path)
\ No newline at end of file
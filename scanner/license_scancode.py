@@ -1,10 +1,12 @@
-import json
-import tempfile
-import subprocess
-import warnings
+import functools
+import itertools
 import os
-from pathlib import Path
+import re
+import sys
+import warnings
+import multiprocessing
 from scanner.patch import Patch
+from scanner.spdx_expression import parse_expression, satisfied_with_leading_choice
 
 warnings.filterwarnings("ignore", message="Libmagic magic database not found")
 
@@ -12,35 +14,138 @@ warnings.filterwarnings("ignore", message="Libmagic magic database not found")
 Module to check for licenses in a patch file using scancode.
 """
 
+# Added and deleted lines of a diff, without their +/- prefix
+_ADDED_LINE_RE = re.compile(r'^\+([^\n]*)', re.MULTILINE)
+_DELETED_LINE_RE = re.compile(r'^-([^\n]*)', re.MULTILINE)
+
+# SPDX-License-Identifier tags on added lines, up to a comment end such as
+# "*/" or "-->"
+_SPDX_ID_RE = re.compile(r'^\+.*SPDX-License-Identifier:\s*([^\n*/]+?)\s*(?:-->|[*/]|$)', re.MULTILINE)
+
+# Define common source file extensions
+SOURCE_FILE_EXTENSIONS = frozenset((
+    '.c', '.cpp', '.h', '.hpp', '.java', '.py', '.js', '.ts', '.rb', '.go', '.swift', '.kt', '.kts', '.sh'
+))
+
+# Number of changes scanned per batch
+BATCH_SIZE = 100
+
+# Below this many text buffers, matching serially beats starting a process pool
+MIN_PARALLEL_JOBS = 4
+
+
+@functools.lru_cache(maxsize=None)
+def get_license_index():
+    """
+    Load the scancode license index once per process.
+
+    The scancode imports are deferred to the first call so that importing
+    this module stays cheap.
+
+    Returns:
+        LicenseIndex: The scancode license index.
+    """
+    from licensedcode.cache import get_index
+    return get_index()
+
+
+def detect_license_expression(text: str) -> str:
+    """
+    Detect licenses in a text buffer with the in-process scancode matcher.
+
+    Args:
+        text (str): The text to scan.
+
+    Returns:
+        str: The SPDX expression of the first license detection, or None.
+    """
+    from licensedcode.detection import detect_licenses
+
+    for detection in detect_licenses(index=get_license_index(), query_string=text):
+        if detection.license_expression:
+            return detection.license_expression_spdx
+    return None
+
+
+def _chunked(items: list, size: int):
+    """
+    Split `items` into consecutive batches of at most `size` items.
+
+    Args:
+        items (list): The items to split.
+        size (int): The maximum batch size.
+
+    Yields:
+        tuple: The offset of the batch in `items` and the batch itself.
+    """
+    iterator = iter(items)
+    offset = 0
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield offset, batch
+        offset += len(batch)
+        batch = list(itertools.islice(iterator, size))
+
+
+def _has_words(line: str) -> bool:
+    """
+    Cheaply check if a line may be part of a license notice.
+
+    Only lines without any letter or digit, such as "}" or "*/", are
+    dropped. Short lines can be the license name itself, e.g. "GPLv2" under
+    "Licensed under", so they are always kept.
+
+    Args:
+        line (str): The line to check.
+
+    Returns:
+        bool: True if the line should be passed to the license matcher.
+    """
+    return any(c.isalnum() for c in line)
+
+
+def _match_license_job(job: tuple) -> tuple:
+    """
+    Detect licenses for a single (change_index, content_type, text) job.
+
+    Args:
+        job (tuple): The job to run.
+
+    Returns:
+        tuple: The (change_index, content_type) key and the detected licenses.
+    """
+    change_idx, content_type, text = job
+    return (change_idx, content_type), detect_license_expression(text)
+
+
 class LicenseChecker:
     """
     Class to check for licenses in a patch file.
     """
 
-    def __init__(self, patch: Patch, repo: str, permissive_licenses: list) -> None:
+    def __init__(self, patch: Patch, repo: str, permissive_licenses) -> None:
         """
         Initialize the LicenseChecker object.
 
         Args:
             patch (Patch): The patch file to check.
             repo (str): The repository name.
-            permissive_licenses (list): A list of permissive licenses.
+            permissive_licenses (iterable): The permissive licenses.
         """
         self.patch = patch
         self.repo = repo
-        self.permissive_licenses = permissive_licenses
+        self.permissive_licenses = frozenset(permissive_licenses)
 
     def is_license_permissive(self, scancode_license: str) -> bool:
         """
         Check if a license is permissive by evaluating SPDX license expressions.
-        
-        Special handling for dual-license scenarios:
-        - If expression starts with (X OR Y), we check if at least one option is permissive
-        - If the same licenses appear later with AND, we ignore them (they're from comments)
-        
-        For OR expressions: At least one option must be permissive
-        For AND expressions: All components must be permissive
-        
+
+        The expression is parsed into an AND/OR tree and evaluated:
+        - For OR expressions: At least one option must be permissive
+        - For AND expressions: All components must be permissive
+        - If the expression starts with a permissive (X OR Y) group, X and Y
+          appearing again later with AND are ignored (they're from comments)
+
         Args:
             scancode_license (str): The SPDX license expression to check.
 
@@ -48,121 +153,99 @@ class LicenseChecker:
             bool: True if the license expression is permissive, False otherwise.
         """
         expression = scancode_license.strip()
-        
-        # Check if this is a dual-license pattern: starts with (X OR Y) AND ...
-        # In this case, if the OR part has a permissive option, we accept it
-        if expression.startswith('(') and ' OR ' in expression.split(')')[0]:
-            # Extract the OR part
-            or_part = expression.split(')')[0] + ')'
-            or_part_clean = or_part.strip('()')
-            or_licenses = [lic.strip() for lic in or_part_clean.split(' OR ')]
-            
-            # Check if at least one license in the OR is permissive
-            for lic in or_licenses:
-                if lic in self.permissive_licenses:
-                    return True
-            
+        if expression in self.permissive_licenses:
+            return True
+
+        try:
+            node = parse_expression(expression)
+        except ValueError:
+            # Flag expressions we cannot parse rather than guessing
             return False
-        
-        # Standard evaluation: split by AND first to get AND-groups
-        and_groups = [group.strip() for group in expression.split(' AND ')]
-        
-        # For each AND group, check if it's permissive
-        for and_group in and_groups:
-            # Check if this group contains OR
-            if ' OR ' in and_group:
-                # Remove parentheses
-                and_group = and_group.strip('()')
-                # Split by OR - at least one must be permissive
-                or_licenses = [lic.strip() for lic in and_group.split(' OR ')]
-                
-                # Check if at least one license in the OR group is permissive
-                has_permissive = False
-                for lic in or_licenses:
-                    if lic in self.permissive_licenses:
-                        has_permissive = True
-                        break
-                
-                if not has_permissive:
-                    return False
-            else:
-                # Single license in this AND group - must be permissive
-                lic = and_group.strip('()')
-                if lic not in self.permissive_licenses:
-                    return False
-        
-        return True
+
+        return satisfied_with_leading_choice(node, self.permissive_licenses)
+
+    def detect_permissive_spdx_identifiers(self, changes: list) -> dict:
+        """
+        Resolve changes whose added lines only declare permissive SPDX identifiers.
+        Args:
+            changes (list): List of changes to check.
+        Returns:
+            dict: Dictionary mapping (change_index, 'added') -> licenses.
+        """
+        results = {}
+        for idx, change in enumerate(changes):
+            content = change['content']
+            if not content:
+                continue
+
+            identifiers = [identifier.strip() for identifier in _SPDX_ID_RE.findall(content)]
+            identifiers = list(dict.fromkeys(filter(None, identifiers)))
+            if identifiers and all(self.is_license_permissive(lic) for lic in identifiers):
+                if len(identifiers) > 1:
+                    identifiers = [f"({lic})" if ' ' in lic else lic for lic in identifiers]
+                results[(idx, 'added')] = sys.intern(" AND ".join(identifiers))
+        return results
 
     def detect_licenses_batch(self, changes: list) -> dict:
         """
-        Detect licenses for multiple changes in a single scancode run.
+        Detect licenses for multiple changes with a single in-process license index.
+
+        Changes are processed in batches of BATCH_SIZE so that the text buffers
+        and pool workers of one batch are released before the next starts.
+        Args:
+            changes (list): List of changes to check.
+        Returns:
+            dict: Dictionary mapping (change_index, content_type) -> licenses.
+        """
+        results = {}
+        for offset, batch in _chunked(changes, BATCH_SIZE):
+            results.update(self._run_one_batch(batch, offset))
+        return results
+
+    def _run_one_batch(self, changes: list, offset: int) -> dict:
+        """
+        Detect licenses for one batch of changes.
         Args:
             changes (list): List of changes to check.
+            offset (int): Index of the first change of the batch in the full list.
         Returns:
             dict: Dictionary mapping (change_index, content_type) -> licenses.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_map = {}
-
-            for idx, change in enumerate(changes):
-                content = change['content']
-                # Check if content is None
-                if not content:
-                    continue
-
-                added_lines = []
-                deleted_lines = []
-                # Separate added and deleted lines
-                for line in content.split('\n'):
-                    if line.startswith('+'):
-                        added_lines.append(line[1:])
-                    elif line.startswith('-'):
-                        deleted_lines.append(line[1:])
-
-                # Join added and deleted lines as-is
-                if added_lines:
-                    added_file = f"{idx}_added.txt"
-                    Path(tmpdir, added_file).write_text("\n".join(added_lines))
-                    file_map[added_file] = (idx, 'added')
-
-                if deleted_lines:
-                    deleted_file = f"{idx}_deleted.txt"
-                    Path(tmpdir, deleted_file).write_text("\n".join(deleted_lines))
-                    file_map[deleted_file] = (idx, 'deleted')
-
-            if not file_map:
-                return {}
-
-            output_file = os.path.join(tmpdir, 'scancode_results.json')
-            subprocess.run([
-                'scancode',
-                '--license',
-                '--strip-root',
-                '--quiet',
-                '--json-pp', output_file,
-                tmpdir
-            ], check=True)
-
-            with open(output_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            results = {}
-            for file_result in data.get('files', []):
-                if file_result['type'] != 'file':
-                    continue
-
-                filename = os.path.basename(file_result['path'])
-                if filename not in file_map:
-                    continue
-
-                licenses = []
-                if len(file_result.get('license_detections', [])):
-                    licenses = file_result['license_detections'][0]['license_expression_spdx']
-
-                change_idx, content_type = file_map[filename]
-                results[(change_idx, content_type)] = licenses
-
-            return results
+        jobs = []
+        for idx, change in enumerate(changes, start=offset):
+            content = change['content']
+            # Check if content is None
+            if not content:
+                continue
+
+            # Separate added and deleted lines, dropping lines without words
+            added_lines = [line for line in _ADDED_LINE_RE.findall(content)
+                           if _has_words(line)]
+            deleted_lines = [line for line in _DELETED_LINE_RE.findall(content)
+                             if _has_words(line)]
+
+            # Join added and deleted lines as-is
+            if added_lines:
+                jobs.append((idx, 'added', "\n".join(added_lines)))
+
+            if deleted_lines:
+                jobs.append((idx, 'deleted', "\n".join(deleted_lines)))
+
+        # License matching is independent per buffer, so spread it over a
+        # process pool unless there is too little work to amortize the workers
+        if len(jobs) < MIN_PARALLEL_JOBS:
+            matched = map(_match_license_job, jobs)
+        else:
+            # Load the index in the parent first: forked workers inherit it
+            # instead of each loading their own copy
+            get_license_index()
+            processes = min(os.cpu_count() or 1, len(jobs))
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                matched = pool.map(_match_license_job, jobs, chunksize=8)
+
+        # Expressions repeat across changes; interning them makes the
+        # comparisons in run() mostly pointer checks
+        return {key: sys.intern(licenses) for key, licenses in matched if licenses}
 
     def is_source_file(self, file_name: str) -> bool:
         """
@@ -174,16 +257,10 @@ class LicenseChecker:
         Returns:
             bool: True if the file is a source file, False otherwise.
         """
-        # Define common source file extensions
-        source_file_extensions = [
-            '.c', '.cpp', '.h', '.hpp', '.java', '.py', '.js', '.ts', '.rb', '.go', '.swift', '.kt', '.kts', '.sh'
-        ]
-
-        # Check if the file extension is in the list of source file extensions
-        for ext in source_file_extensions:
-            if file_name.endswith(ext):
-                return True
-        return False
+        # splitext() gives dotfiles such as ".sh" no extension; the whole
+        # name is their extension, as with str.endswith()
+        ext = os.path.splitext(file_name)[1] or os.path.basename(file_name)
+        return ext in SOURCE_FILE_EXTENSIONS
 
     def run(self) -> dict:
         """
@@ -199,7 +276,12 @@ class LicenseChecker:
         if not source_files:
             return flagged_files
 
-        license_results = self.detect_licenses_batch(source_files)
+        # Changes whose SPDX identifiers are all permissive pass regardless of
+        # what else scancode would find in them, so they are not scanned
+        license_results = self.detect_permissive_spdx_identifiers(source_files)
+        pending = [dict(change, content=None) if (idx, 'added') in license_results else change
+                   for idx, change in enumerate(source_files)]
+        license_results.update(self.detect_licenses_batch(pending))
 
         for idx, change in enumerate(source_files):
             added_licenses = license_results.get((idx, 'added'), [])
@@ -208,7 +290,7 @@ class LicenseChecker:
             issues = []
             if change['change_type'] == 'MODIFIED' or change['change_type'] == 'ADDED':
                 # Check if licenses changed
-                if added_licenses and deleted_licenses and set(added_licenses) != set(deleted_licenses):
+                if added_licenses and deleted_licenses and added_licenses != deleted_licenses:
                     # Only flag if the new license is NOT permissive
                     # This allows dual-license scenarios like "BSD-3-Clause OR GPL-2.0-only"
                     # where at least one option is permissive
@@ -220,12 +302,11 @@ class LicenseChecker:
                 elif deleted_licenses and not added_licenses:
                     # License was removed without replacement
                     issues.append(f"License deleted: {deleted_licenses}")
-                
-                if issues:
-                    flagged_files[change['path_name']] = issues
+
             if change['change_type'] == 'ADDED':
                 if not added_licenses and self.is_source_file(change['path_name']):
                     issues.append(f"No license added for source file: {change['path_name']}")
-                    if issues:
-                        flagged_files[change['path_name']] = issues
+
+            if issues:
+                flagged_files[change['path_name']] = issues
         return flagged_files
@@ -5,6 +5,14 @@ from scanner.ignore_config import IgnoreConfig
 Module to represent and process patch files.
 """
 
+# Start of a file section; everything before the first one is commit meta
+_FILE_DELIM_RE = re.compile(r'^diff .* b\/(?P<file_name>.*)$')
+_MODE_RE = re.compile(r'(\w*) file mode')
+
+# File extensions excluded from all checks. str.endswith() with a tuple is a
+# single C-level call, and about twice as fast as an equivalent regex search
+_SKIPPED_EXTENSIONS = ('.patch', '.bb', '.md', '.json', '.yml')
+
 class Patch:
     """
     Class to represent a patch file.
@@ -14,54 +22,107 @@ class Patch:
         """
         Initialize the Patch object.
 
+        The patch is read line by line, so the whole file buffer and a
+        re.split() list of it are no longer held in memory. The content of
+        every file that is not skipped is still kept in self.changes.
+
         Args:
             patchfile (str): The path to the patch file.
         """
         self.patchfile = patchfile
         self.ignore_config = IgnoreConfig()
 
+        # Create the list of changes in each file
+        self.changes = []
         with open(self.patchfile, 'r', encoding='utf-8') as f:
-            self.patch_content = f.read()
+            section = None
+            for line in f:
+                match = _FILE_DELIM_RE.match(line)
+                if match:
+                    self._add_change(section)
+                    section = self._new_section(match.group('file_name'))
+                elif section is not None and not section['skip']:
+                    self._parse_line(section, line)
+            self._add_change(section)
 
-        # Split patch into meta (git commit, summary) vs. code content
-        file_delimiter_regex = r'^diff .* b\/(?P<file_name>.*)$'
-        r = re.split(file_delimiter_regex, self.patch_content, flags=re.MULTILINE)
-        patch_content = r[1:]
-        files_changes = list(zip(patch_content[::2], patch_content[1::2]))
+    def _new_section(self, path_name: str) -> dict:
+        """
+        Start parsing the section of the patch for a single file.
 
-        # Create the list of changes in each file
-        self.changes = []
-        for path_name, file_change in files_changes:
-            # figure change type
-            change_type = re.search(r"(\w*) file mode", file_change, re.MULTILINE)
-            if change_type and change_type.group(1) == "new":
-                change_type = "ADDED"
-            elif change_type and change_type.group(1) == "deleted":
-                change_type = "DELETED"
-            elif re.search("rename from .*\nrename to .*", file_change, re.MULTILINE):
-                change_type = "RENAMED"
-            else:
-                change_type = "MODIFIED"
-
-            # match[0] contains meta, match[1] contains file content if any
-            file_content = re.split(r"(?:\+\+\+ .*|GIT binary patch)", file_change)
-            file_content = file_content[1] if len(file_content) > 1 else None
-
-            file_type = "binary" if "GIT binary patch" in file_change else "source"
-
-            # Skip files that match hardcoded exclusions or config-based exclusions
-            if path_name.endswith(('.patch', '.bb', '.md', '.json', '.yml')):
-                continue
-
-            if self.ignore_config.is_excluded(path_name):
-                continue
-
-            self.changes.append({
-                'path_name': path_name,
-                'file_type': file_type,
-                'change_type': change_type,
-                'content': file_content
-            })
+        Args:
+            path_name (str): The path of the changed file.
+
+        Returns:
+            dict: The parser state for the file section.
+        """
+        # Skip files that match hardcoded exclusions or config-based exclusions
+        skip = (path_name.endswith(_SKIPPED_EXTENSIONS)
+                or self.ignore_config.is_excluded(path_name))
+        return {
+            'path_name': path_name,
+            'skip': skip,
+            'mode': None,
+            'renamed_from': False,
+            'renamed': False,
+            'file_type': 'source',
+            'content': None
+        }
+
+    @staticmethod
+    def _parse_line(section: dict, line: str) -> None:
+        """
+        Feed one line of a file section to the parser state.
+
+        Args:
+            section (dict): The parser state for the file section.
+            line (str): The line to parse.
+        """
+        # Once the header is done, every line belongs to the file content
+        if section['content'] is not None:
+            section['content'].append(line)
+            return
+
+        if line.startswith('+++ '):
+            section['content'] = ['\n']
+        elif line.startswith('GIT binary patch'):
+            section['file_type'] = 'binary'
+            section['content'] = ['\n']
+        elif line.startswith('rename to ') and section['renamed_from']:
+            section['renamed'] = True
+        elif section['mode'] is None:
+            mode = _MODE_RE.search(line)
+            if mode:
+                section['mode'] = mode.group(1)
+
+        section['renamed_from'] = line.startswith('rename from ')
+
+    def _add_change(self, section: dict) -> None:
+        """
+        Record the change for a completely parsed file section.
+
+        Args:
+            section (dict): The parser state for the file section, or None.
+        """
+        if section is None or section['skip']:
+            return
+
+        # figure change type
+        if section['mode'] == "new":
+            change_type = "ADDED"
+        elif section['mode'] == "deleted":
+            change_type = "DELETED"
+        elif section['renamed']:
+            change_type = "RENAMED"
+        else:
+            change_type = "MODIFIED"
+
+        content = section['content']
+        self.changes.append({
+            'path_name': section['path_name'],
+            'file_type': section['file_type'],
+            'change_type': change_type,
+            'content': ''.join(content) if content is not None else None
+        })
 
     def get_changes(self):
         """
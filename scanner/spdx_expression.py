@@ -0,0 +1,200 @@
+import functools
+import re
+
+"""
+Module to parse and evaluate SPDX license expressions.
+"""
+
+_TOKEN_RE = re.compile(r'\(|\)|[^\s()]+')
+
+
+class Lic:
+    """
+    A single license, including any "WITH <exception>" suffix.
+    """
+    __slots__ = ('key', 'license_keys')
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.license_keys = frozenset((key,))
+
+    def __repr__(self) -> str:
+        return f"Lic({self.key!r})"
+
+    def satisfied_by(self, licenses) -> bool:
+        """
+        Check if this expression is satisfied when only `licenses` are allowed.
+
+        Args:
+            licenses: A container of allowed license keys.
+
+        Returns:
+            bool: True if the expression is satisfied, False otherwise.
+        """
+        return self.key in licenses
+
+
+class Or:
+    """
+    A choice between licenses: satisfied if any child is.
+    """
+    __slots__ = ('children', 'license_keys')
+
+    def __init__(self, children: list) -> None:
+        self.children = tuple(children)
+        self.license_keys = frozenset().union(*(child.license_keys for child in self.children))
+
+    def __repr__(self) -> str:
+        return f"Or({list(self.children)!r})"
+
+    def satisfied_by(self, licenses) -> bool:
+        return any(child.satisfied_by(licenses) for child in self.children)
+
+
+class And:
+    """
+    A conjunction of licenses: satisfied if every child is.
+    """
+    __slots__ = ('children', 'license_keys')
+
+    def __init__(self, children: list) -> None:
+        self.children = tuple(children)
+        self.license_keys = frozenset().union(*(child.license_keys for child in self.children))
+
+    def __repr__(self) -> str:
+        return f"And({list(self.children)!r})"
+
+    def satisfied_by(self, licenses) -> bool:
+        return all(child.satisfied_by(licenses) for child in self.children)
+
+
+class _Parser:
+    """
+    Recursive-descent parser for SPDX license expressions.
+
+    Grammar, with AND binding tighter than OR:
+        or_expr  := and_expr ("OR" and_expr)*
+        and_expr := atom ("AND" atom)*
+        atom     := "(" or_expr ")" | license ["WITH" exception]
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = _TOKEN_RE.findall(expression)
+        self.pos = 0
+
+    def _peek(self) -> str:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of license expression: {self.expression!r}")
+        self.pos += 1
+        return token
+
+    def _is_operator(self, name: str) -> bool:
+        token = self._peek()
+        return token is not None and token.upper() == name
+
+    def parse(self):
+        node = self._or_expr()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected token {self._peek()!r} in: {self.expression!r}")
+        return node
+
+    def _or_expr(self):
+        children = [self._and_expr()]
+        while self._is_operator('OR'):
+            self.pos += 1
+            children.append(self._and_expr())
+        return _combine(Or, children)
+
+    def _and_expr(self):
+        children = [self._atom()]
+        while self._is_operator('AND'):
+            self.pos += 1
+            children.append(self._atom())
+        return _combine(And, children)
+
+    def _atom(self):
+        token = self._next()
+        if token == '(':
+            node = self._or_expr()
+            if self._next() != ')':
+                raise ValueError(f"Unbalanced parentheses in: {self.expression!r}")
+            return node
+        if token == ')' or token.upper() in ('AND', 'OR', 'WITH'):
+            raise ValueError(f"Unexpected token {token!r} in: {self.expression!r}")
+        if self._is_operator('WITH'):
+            self.pos += 1
+            token = f"{token} WITH {self._next()}"
+        return Lic(token)
+
+
+def _combine(node_type, children: list):
+    """
+    Build a `node_type` node, flattening directly nested nodes of the same type.
+    """
+    if len(children) == 1:
+        return children[0]
+    flat = []
+    for child in children:
+        if isinstance(child, node_type):
+            flat.extend(child.children)
+        else:
+            flat.append(child)
+    return node_type(flat)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_expression(expression: str):
+    """
+    Parse an SPDX license expression into a tree of Lic, And and Or nodes.
+
+    Parsed trees are cached, so identical expressions seen across many files
+    are only parsed once.
+
+    Args:
+        expression (str): The SPDX license expression.
+
+    Returns:
+        Lic | And | Or: The root node of the expression.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return _Parser(expression).parse()
+
+
+def satisfied_with_leading_choice(node, licenses) -> bool:
+    """
+    Evaluate `node`, allowing for a leading dual-license choice.
+
+    Dual-license headers such as "(BSD-3-Clause OR GPL-2.0-only)" are often
+    reported followed by the licenses they offer, e.g.
+    "(BSD-3-Clause OR GPL-2.0-only) AND GPL-2.0-only". When the expression
+    starts with a parenthesized OR group that is satisfied, licenses repeated
+    from that group later in the top-level AND are ignored. Anything else is
+    evaluated strictly.
+
+    Args:
+        node (Lic | And | Or): The root node of the expression.
+        licenses: A container of allowed license keys.
+
+    Returns:
+        bool: True if the expression is satisfied, False otherwise.
+    """
+    if node.satisfied_by(licenses):
+        return True
+    if not isinstance(node, And) or not isinstance(node.children[0], Or):
+        return False
+
+    choice = node.children[0]
+    if not choice.satisfied_by(licenses):
+        return False
+    return all(
+        child.satisfied_by(licenses)
+        or (isinstance(child, Lic) and child.key in choice.license_keys)
+        for child in node.children[1:]
+    )
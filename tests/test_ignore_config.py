@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from scanner.ignore_config import IgnoreConfig
+
+"""
+Tests for matching paths against .licenseignore patterns.
+"""
+
+PATHS = [
+    'build', 'build/out.o', 'src/build/out.o', 'src/build',
+    'docs/index.c', 'src/docs/index.c', 'docs',
+    'gen/a.c', 'src/gen/a.c', 'src/gen/sub/a.c', 'src/gen/a.h',
+    'third_party/x/y/z.c', 'third_party/z.c', 'other/third_party/z.c',
+    'vendor/keep.c', 'vendor/drop.c', 'main.c', 'a/b/main.py', './main.c',
+]
+
+
+class IgnoreConfigTest(unittest.TestCase):
+
+    def load(self, text: str) -> IgnoreConfig:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        ignore_path = os.path.join(tmpdir.name, '.licenseignore')
+        with open(ignore_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return IgnoreConfig(ignore_path)
+
+    def assert_matches_pathspec(self, config: IgnoreConfig) -> None:
+        for path in PATHS:
+            with self.subTest(path=path):
+                self.assertEqual(config.is_excluded(path), config.spec.match_file(path))
+
+    def test_union_matches_pathspec(self):
+        patterns = {
+            'anchored': '/build\n',
+            'directory': 'docs/\n',
+            'leading **': '**/gen/*.c\n',
+            'inner **': 'third_party/**/z.c\n',
+            'trailing **': 'vendor/**\n',
+            'plain glob': '*.py\n',
+        }
+        for name, text in patterns.items():
+            with self.subTest(pattern=name):
+                config = self.load(text)
+                self.assertIsNotNone(config.regex)
+                self.assert_matches_pathspec(config)
+
+        config = self.load(''.join(patterns.values()))
+        self.assertIsNotNone(config.regex)
+        self.assert_matches_pathspec(config)
+
+    def test_negated_patterns_fall_back_to_pathspec(self):
+        config = self.load('vendor/**\n!vendor/keep.c\n')
+        self.assertIsNone(config.regex)
+        self.assertTrue(config.is_excluded('vendor/drop.c'))
+        self.assertFalse(config.is_excluded('vendor/keep.c'))
+        self.assert_matches_pathspec(config)
+
+    def test_comment_only_file_excludes_nothing(self):
+        config = self.load('# nothing to ignore\n\n   # indented comment\n')
+        self.assertEqual(config.patterns, [])
+        self.assertIsNone(config.regex)
+        for path in PATHS:
+            with self.subTest(path=path):
+                self.assertFalse(config.is_excluded(path))
+
+    def test_missing_file_excludes_nothing(self):
+        config = IgnoreConfig(os.path.join(tempfile.gettempdir(), 'no-such-dir', '.licenseignore'))
+        self.assertIsNone(config.spec)
+        self.assertFalse(config.is_excluded('main.c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
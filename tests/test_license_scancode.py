@@ -0,0 +1,102 @@
+import types
+import unittest
+
+from scanner.license_scancode import LicenseChecker
+
+"""
+Tests for license detection on patch changes.
+
+These run the real scancode matcher, so the first test pays for loading the
+license index.
+"""
+
+PERMISSIVE = ['BSD-3-Clause', 'MIT']
+
+
+def make_change(path_name: str, content: str, change_type: str = 'MODIFIED') -> dict:
+    return {
+        'path_name': path_name,
+        'file_type': 'source',
+        'change_type': change_type,
+        'content': content
+    }
+
+
+def run_checker(*changes: dict) -> dict:
+    patch = types.SimpleNamespace(changes=list(changes))
+    return LicenseChecker(patch, 'repo', PERMISSIVE).run()
+
+
+class DocstringHeaderTest(unittest.TestCase):
+
+    def test_added_license_name_line(self):
+        change = make_change('a.py', '\n@@ -1,3 +1,4 @@\n """\n Module docs.\n+GPL-3.0-only\n """\n')
+        self.assertEqual(run_checker(change),
+                         {'a.py': ['Incompatible license added: GPL-3.0-only']})
+
+    def test_added_short_license_notice(self):
+        change = make_change('b.py', '\n@@ -1,3 +1,5 @@\n """\n Module docs.\n+Licensed under\n+GPLv2\n """\n')
+        self.assertEqual(run_checker(change),
+                         {'b.py': ['Incompatible license added: GPL-2.0-only']})
+
+    def test_deleted_short_license_notice(self):
+        change = make_change('c.py', '\n@@ -1,5 +1,3 @@\n """\n Module docs.\n-Licensed under\n-GPLv2\n """\n')
+        self.assertEqual(run_checker(change),
+                         {'c.py': ['License deleted: GPL-2.0-only']})
+
+    def test_lines_without_words_are_not_detected(self):
+        change = make_change('d.c', '\n@@ -1 +1,3 @@\n+}\n+*/\n-{\n')
+        self.assertEqual(run_checker(change), {})
+
+
+class PermissiveSpdxIdentifierTest(unittest.TestCase):
+
+    def detect(self, content: str) -> dict:
+        checker = LicenseChecker(None, 'repo', PERMISSIVE)
+        return checker.detect_permissive_spdx_identifiers([make_change('x.c', content)])
+
+    def test_single_tag(self):
+        self.assertEqual(self.detect('+// SPDX-License-Identifier: MIT\n'),
+                         {(0, 'added'): 'MIT'})
+
+    def test_several_tags_are_joined_with_and(self):
+        content = ('+# SPDX-License-Identifier: MIT\n'
+                   '+# SPDX-License-Identifier: BSD-3-Clause\n'
+                   '+# SPDX-License-Identifier: MIT\n')
+        self.assertEqual(self.detect(content), {(0, 'added'): 'MIT AND BSD-3-Clause'})
+
+    def test_choice_tag(self):
+        content = ('+// SPDX-License-Identifier: (MIT OR GPL-2.0-only)\n'
+                   '+// SPDX-License-Identifier: BSD-3-Clause\n')
+        self.assertEqual(self.detect(content),
+                         {(0, 'added'): '((MIT OR GPL-2.0-only)) AND BSD-3-Clause'})
+
+    def test_comment_ends_are_stripped(self):
+        for content in ('+/* SPDX-License-Identifier: MIT */\n',
+                        '+<!-- SPDX-License-Identifier: MIT -->\n'):
+            with self.subTest(content=content):
+                self.assertEqual(self.detect(content), {(0, 'added'): 'MIT'})
+
+    def test_non_permissive_tag_is_left_for_scanning(self):
+        content = ('+// SPDX-License-Identifier: MIT\n'
+                   '+// SPDX-License-Identifier: GPL-2.0-only\n')
+        self.assertEqual(self.detect(content), {})
+
+    def test_deleted_tags_are_ignored(self):
+        self.assertEqual(self.detect('-// SPDX-License-Identifier: MIT\n+int x;\n'), {})
+
+    def test_resolved_changes_keep_indices_aligned(self):
+        gpl = ('\n@@ -0,0 +1,2 @@\n'
+               '+/* This program is free software; you can redistribute it and/or modify it\n'
+               '+ * under the terms of the GNU General Public License version 2. */\n')
+        results = run_checker(
+            make_change('first.c', '+// SPDX-License-Identifier: MIT\n', 'ADDED'),
+            make_change('second.c', gpl, 'ADDED'),
+            make_change('third.c', '+// SPDX-License-Identifier: BSD-3-Clause\n' + gpl, 'ADDED'),
+        )
+        self.assertEqual(list(results), ['second.c'])
+        self.assertTrue(results['second.c'][0].startswith('Incompatible license added: GPL-2.0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
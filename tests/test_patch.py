@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from scanner.patch import Patch
+
+"""
+Tests for parsing patch files into per-file changes.
+"""
+
+PATCH = """\
+From 1234567 Mon Sep 17 00:00:00 2001
+Subject: [PATCH] new file mode for +++ the checker
+
+diff --git a/src/new.c b/src/new.c
+new file mode 100644
+index 0000000..1111111
+--- /dev/null
++++ b/src/new.c
+@@ -0,0 +1,2 @@
++// SPDX-License-Identifier: MIT
++int x;
+diff --git a/src/gone.c b/src/gone.c
+deleted file mode 100644
+index 1111111..0000000
+--- a/src/gone.c
++++ /dev/null
+@@ -1 +0,0 @@
+-int y;
+diff --git a/old.c b/new_name.c
+similarity index 100%
+rename from old.c
+rename to new_name.c
+diff --git a/img.png b/img.png
+new file mode 100644
+index 0000000..abcdef
+GIT binary patch
+literal 10
+RcmZ?wbhEHbRAgWP0RRC
+
+diff --git a/src/tricky.py b/src/tricky.py
+index 1111111..2222222 100644
+--- a/src/tricky.py
++++ b/src/tricky.py
+@@ -1,2 +1,3 @@
+ MARKER = "GIT binary patch"
+-x = 1
+++++ y
++z = 2
+diff --git a/README.md b/README.md
+--- a/README.md
++++ b/README.md
+@@ -1 +1 @@
+-a
++b
+diff --git a/.md b/.md
+--- a/.md
++++ b/.md
+@@ -1 +1 @@
+-a
++b
+"""
+
+
+class PatchTest(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        # IgnoreConfig reads .licenseignore from the working directory
+        cwd = os.getcwd()
+        os.chdir(tmpdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        patchfile = os.path.join(tmpdir.name, 'test.patch')
+        with open(patchfile, 'w', encoding='utf-8') as f:
+            f.write(PATCH)
+        self.changes = {change['path_name']: change for change in Patch(patchfile).changes}
+
+    def test_text_before_first_diff_is_ignored(self):
+        self.assertEqual(list(self.changes),
+                         ['src/new.c', 'src/gone.c', 'new_name.c', 'img.png', 'src/tricky.py'])
+
+    def test_change_types(self):
+        self.assertEqual(self.changes['src/new.c']['change_type'], 'ADDED')
+        self.assertEqual(self.changes['src/gone.c']['change_type'], 'DELETED')
+        self.assertEqual(self.changes['new_name.c']['change_type'], 'RENAMED')
+        self.assertEqual(self.changes['src/tricky.py']['change_type'], 'MODIFIED')
+
+    def test_content_starts_after_header(self):
+        self.assertEqual(self.changes['src/new.c']['content'],
+                         '\n@@ -0,0 +1,2 @@\n+// SPDX-License-Identifier: MIT\n+int x;\n')
+
+    def test_pure_rename_has_no_content(self):
+        self.assertIsNone(self.changes['new_name.c']['content'])
+        self.assertEqual(self.changes['new_name.c']['file_type'], 'source')
+
+    def test_binary_section(self):
+        self.assertEqual(self.changes['img.png']['file_type'], 'binary')
+        self.assertEqual(self.changes['img.png']['change_type'], 'ADDED')
+
+    def test_markers_inside_content_are_plain_lines(self):
+        change = self.changes['src/tricky.py']
+        self.assertEqual(change['file_type'], 'source')
+        self.assertTrue(change['content'].endswith('-x = 1\n++++ y\n+z = 2\n'))
+
+    def test_excluded_extensions_are_skipped(self):
+        self.assertNotIn('README.md', self.changes)
+        self.assertNotIn('.md', self.changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
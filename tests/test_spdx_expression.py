@@ -0,0 +1,72 @@
+import unittest
+
+from scanner.spdx_expression import And, Lic, Or, parse_expression, satisfied_with_leading_choice
+
+"""
+Tests for SPDX license expression parsing and evaluation.
+"""
+
+PERMISSIVE = frozenset(['MIT', 'BSD-3-Clause', 'Apache-2.0 WITH LLVM-exception'])
+
+
+class ParseExpressionTest(unittest.TestCase):
+
+    def test_and_binds_tighter_than_or(self):
+        node = parse_expression('MIT OR BSD-3-Clause AND GPL-2.0-only')
+        self.assertIsInstance(node, Or)
+        self.assertIsInstance(node.children[0], Lic)
+        self.assertIsInstance(node.children[1], And)
+        self.assertEqual(node.children[1].license_keys, {'BSD-3-Clause', 'GPL-2.0-only'})
+
+    def test_parentheses_override_precedence(self):
+        node = parse_expression('(MIT OR BSD-3-Clause) AND GPL-2.0-only')
+        self.assertIsInstance(node, And)
+        self.assertIsInstance(node.children[0], Or)
+
+    def test_with_is_a_single_license(self):
+        node = parse_expression('Apache-2.0 WITH LLVM-exception AND MIT')
+        self.assertEqual([child.key for child in node.children],
+                         ['Apache-2.0 WITH LLVM-exception', 'MIT'])
+
+    def test_nested_operators_are_flattened(self):
+        node = parse_expression('MIT AND (BSD-3-Clause AND ISC)')
+        self.assertEqual(len(node.children), 3)
+
+    def test_malformed_expressions_raise(self):
+        for expression in ('', 'MIT AND', 'AND MIT', '(MIT OR BSD-3-Clause', 'MIT)',
+                           'MIT WITH', 'MIT BSD-3-Clause'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    parse_expression(expression)
+
+
+class EvaluateExpressionTest(unittest.TestCase):
+
+    def check(self, expression: str) -> bool:
+        return satisfied_with_leading_choice(parse_expression(expression), PERMISSIVE)
+
+    def test_or_needs_one_permissive_option(self):
+        self.assertTrue(self.check('MIT OR GPL-2.0-only'))
+        self.assertFalse(self.check('GPL-2.0-only OR GPL-3.0-only'))
+
+    def test_and_needs_every_license(self):
+        self.assertTrue(self.check('MIT AND BSD-3-Clause'))
+        self.assertFalse(self.check('MIT AND GPL-2.0-only'))
+
+    def test_nested_choices(self):
+        self.assertTrue(self.check('(MIT OR GPL-2.0-only) AND (BSD-3-Clause OR GPL-3.0-only)'))
+        self.assertFalse(self.check('(GPL-2.0-only OR GPL-3.0-only) AND MIT'))
+
+    def test_leading_choice_ignores_repeated_options(self):
+        self.assertTrue(self.check('(BSD-3-Clause OR GPL-2.0-only) AND GPL-2.0-only'))
+
+    def test_leading_choice_does_not_cover_other_licenses(self):
+        self.assertFalse(self.check('(BSD-3-Clause OR GPL-2.0-only) AND GPL-3.0-only'))
+
+    def test_choice_only_exempts_when_leading(self):
+        self.assertFalse(self.check('GPL-2.0-only AND (MIT OR GPL-2.0-only)'))
+        self.assertFalse(self.check('BSD-3-Clause AND (GPL-2.0-only OR MIT) AND GPL-2.0-only'))
+
+
+if __name__ == '__main__':
+    unittest.main()